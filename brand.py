@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+# === BRAND CONFIG ===
+# Shared by ingest.py (which stores a Color column) and both dashboards
+TEAM_COLORS = {
+    "Red Bull Racing": "#0600EF", "Ferrari": "#DC0000", "McLaren": "#FF8700",
+    "Mercedes": "#00D2BE", "Aston Martin": "#006F62", "Alpine": "#0090FF",
+    "Williams": "#005AFF", "RB": "#6692FF", "Kick Sauber": "#52E252",
+    "Haas F1 Team": "#B6BABD", "Haas": "#B6BABD", "Sauber": "#52E252",
+    "AlphaTauri": "#2B4562", "Racing Bulls": "#6692FF"
+}
+DEFAULT_COLOR = "#FF4B4B"
+
+def team_colors(teams):
+    # Look up each distinct team once, then take by category code;
+    # the trailing default catches code -1 (missing team)
+    teams = teams.astype("category")
+    palette = np.array([TEAM_COLORS.get(c, DEFAULT_COLOR) for c in teams.cat.categories] + [DEFAULT_COLOR], dtype=object)
+    return pd.Series(palette[teams.cat.codes.to_numpy()], index=teams.index)
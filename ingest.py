@@ -1,31 +1,117 @@
 import fastf1
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+from brand import team_colors
 
 # === CONFIGURATION ===
 OUTPUT_DIR = r"C:\Users\louie\OneDrive\Desktop\F1_Data"
 CACHE_DIR = os.path.join(OUTPUT_DIR, 'cache')
+TIME_COLS = ['LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time']
+MAX_WORKERS = 8  # session.load() mostly waits on the network
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(CACHE_DIR, exist_ok=True)
 
 fastf1.Cache.enable_cache(CACHE_DIR)
 
+def save_event(laps, name):
+    # One Year=/RoundNumber= partition per event, so earlier events are never rewritten
+    ds.write_dataset(
+        pa.Table.from_pandas(laps, preserve_index=False),
+        os.path.join(OUTPUT_DIR, name),
+        format='parquet',
+        file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+        partitioning=['Year', 'RoundNumber'],
+        partitioning_flavor='hive',
+        basename_template='part-{i}.parquet',
+        existing_data_behavior='delete_matching',
+    )
+
+def append_csv(laps, path):
+    # Only the new session's rows are written; later appends follow the existing header.
+    # Times go back to timedelta so the CSV keeps the "0 days 00:01:29.771000" format of earlier runs
+    laps = laps.assign(**{c: pd.to_timedelta(laps[c], unit='s') for c in TIME_COLS})
+    if os.path.exists(path):
+        cols = pd.read_csv(path, nrows=0).columns
+        laps.reindex(columns=cols).to_csv(path, mode='a', header=False, index=False)
+    else:
+        laps.to_csv(path, index=False)
+
+def saved_sessions(name):
+    # (Year, RoundNumber, Session) already in a Parquet dataset; the dashboards only read these
+    path = os.path.join(OUTPUT_DIR, name)
+    if not os.path.exists(path): return set()
+    prev = pd.read_parquet(path, columns=['Year', 'RoundNumber', 'Session'])
+    prev = prev.astype({'Year': int, 'RoundNumber': int, 'Session': str}).drop_duplicates()
+    return set(prev.itertuples(index=False, name=None))
+
+def load_session(year, rnd, code, label, name):
+    try:
+        session = fastf1.get_session(year, rnd, code)
+        session.load(telemetry=False, weather=False, messages=False)
+        
+        if not hasattr(session, 'laps') or session.laps.empty:
+            return None
+
+        laps = session.laps
+        laps['Driver'] = laps['Driver'].astype('category')
+        
+        # Merge Points/Positions
+        if hasattr(session, 'results') and not session.results.empty:
+            res = session.results.reset_index()
+            # Keep only available columns
+            cols = ['Abbreviation', 'ClassifiedPosition', 'Points', 'Status']
+            res = res[[c for c in cols if c in res.columns]]
+            res = res.rename(columns={'Abbreviation': 'Driver', 'ClassifiedPosition': 'OfficialPos', 'Points': 'OfficialPoints'})
+            # Drivers without laps (DNS) would all map to a NaN category
+            res = res[res['Driver'].isin(laps['Driver'])]
+            res = res.astype({'Driver': laps['Driver'].dtype})
+            laps = laps.merge(res, on='Driver', how='left', validate='many_to_one')
+
+        laps['Year'] = year
+        laps['RoundNumber'] = rnd
+        laps['EventName'] = name
+        laps['Session'] = label
+
+        # Low-cardinality strings are stored as categories (int codes on disk and in memory)
+        for c in ['Team', 'EventName', 'Session']:
+            laps[c] = laps[c].astype('category')
+        laps['Color'] = team_colors(laps['Team']).astype('category')
+
+        # Store lap/sector times as float seconds so the dashboards never re-parse them
+        for c in TIME_COLS:
+            laps[c] = pd.to_timedelta(laps[c]).dt.total_seconds()
+        return laps
+    except Exception:
+        return None
+
 def get_data_for_years(start_year):
     # Current date (Jan 31, 2026)
     current_year = datetime.now().year
     
-    # We will build these lists up year by year
-    all_race_laps = []
-    all_sprint_laps = []
+    path_r = os.path.join(OUTPUT_DIR, 'race_laps_2024_onwards.csv')
+    path_s = os.path.join(OUTPUT_DIR, 'sprint_laps_2024_onwards.csv')
 
     print(f"Target Folder: {OUTPUT_DIR}")
 
+    # Skip sessions a previous run already saved to Parquet
+    existing = saved_sessions('race.parquet') | saved_sessions('sprint.parquet')
+
+    # CSVs from older runs may hold sessions the Parquet datasets don't yet; never append those twice
+    in_csv = set()
+    for path in (path_r, path_s):
+        if os.path.exists(path):
+            prev = pd.read_csv(path, usecols=['Year', 'RoundNumber', 'Session']).drop_duplicates()
+            in_csv |= set(prev.itertuples(index=False, name=None))
+
     # Loop through 2024, 2025, 2026
     for year in range(start_year, current_year + 1):
         print(f"\n=== PROCESSING YEAR {year} ===")
-        
+    
         try:
             # 1. Get Schedule
             try:
@@ -36,12 +122,13 @@ def get_data_for_years(start_year):
 
             # 2. Filter for completed events
             completed_events = schedule[schedule['EventDate'] < pd.Timestamp(datetime.now())]
-            
+        
             if completed_events.empty:
                 print(f"No completed events found for {year}.")
                 continue
 
-            # 3. Process Events
+            # 3. Queue Sessions
+            tasks = []
             for _, event in completed_events.iterrows():
                 # Skip testing
                 if event['EventFormat'] == 'testing': continue
@@ -50,58 +137,28 @@ def get_data_for_years(start_year):
                 name = event['EventName']
                 print(f"  Round {rnd}: {name}")
 
-                # --- HELPER FUNCTION ---
-                def load_session(code, label):
-                    try:
-                        session = fastf1.get_session(year, rnd, code)
-                        session.load(telemetry=False, weather=False, messages=False)
-                        
-                        if not hasattr(session, 'laps') or session.laps.empty:
-                            return None
-
-                        laps = session.laps
-                        
-                        # Merge Points/Positions
-                        if hasattr(session, 'results') and not session.results.empty:
-                            res = session.results.reset_index()
-                            # Keep only available columns
-                            cols = ['Abbreviation', 'ClassifiedPosition', 'Points', 'Status']
-                            res = res[[c for c in cols if c in res.columns]]
-                            res = res.rename(columns={'Abbreviation': 'Driver', 'ClassifiedPosition': 'OfficialPos', 'Points': 'OfficialPoints'})
-                            laps = laps.merge(res, on='Driver', how='left')
-
-                        laps['Year'] = year
-                        laps['RoundNumber'] = rnd
-                        laps['EventName'] = name
-                        laps['Session'] = label
-                        return laps
-                    except Exception:
-                        return None
-
-                # Load Race
-                r = load_session('R', 'Race')
-                if r is not None: all_race_laps.append(r)
-
-                # Load Sprint
+                if (year, rnd, 'Race') not in existing:
+                    tasks.append((year, rnd, 'R', 'Race', name))
                 if event['EventFormat'] in ['sprint', 'sprint_shootout', 'sprint_qualifying']:
-                    s = load_session('S', 'Sprint')
-                    if s is not None: all_sprint_laps.append(s)
-
-            # === CRITICAL FIX: SAVE AFTER EVERY YEAR ===
-            # This ensures that if 2026 crashes, 2025 is already saved.
-            if all_race_laps:
-                path_r = os.path.join(OUTPUT_DIR, 'race_laps_2024_onwards.csv')
-                pd.concat(all_race_laps).to_csv(path_r, index=False)
-                print(f"  >> Saved progress to {path_r}")
-            
-            if all_sprint_laps:
-                path_s = os.path.join(OUTPUT_DIR, 'sprint_laps_2024_onwards.csv')
-                pd.concat(all_sprint_laps).to_csv(path_s, index=False)
-                print(f"  >> Saved progress to {path_s}")
+                    if (year, rnd, 'Sprint') not in existing:
+                        tasks.append((year, rnd, 'S', 'Sprint', name))
+
+            # 4. Load Sessions in parallel, write results from this thread
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+                results = ex.map(lambda t: load_session(*t), tasks)
+                for task, laps in zip(tasks, results):
+                    if laps is None: continue
+                    if task[3] == 'Race':
+                        dataset, path = 'race.parquet', path_r
+                    else:
+                        dataset, path = 'sprint.parquet', path_s
+                    save_event(laps, dataset)
+                    if (task[0], task[1], task[3]) not in in_csv:
+                        append_csv(laps, path)
 
         except Exception as e:
             print(f"❌ CRASHED while processing {year}: {e}")
-            print("Don't worry, previous years were saved.")
+            print("Don't worry, every session loaded before this was already saved.")
 
 if __name__ == "__main__":
     get_data_for_years(2024)
\ No newline at end of file
@@ -1,182 +1,180 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
-from PIL import Image, ImageDraw, ImageFont
-import io
+from brand import team_colors
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
 
 # === BRAND CONFIG ===
 DATA_DIR = "data"  # GitHub-safe relative path
 
-TEAM_COLORS = {
-    "Red Bull Racing": "#0600EF", "Ferrari": "#DC0000", "McLaren": "#FF8700",
-    "Mercedes": "#00D2BE", "Aston Martin": "#006F62", "Alpine": "#0090FF",
-    "Williams": "#005AFF", "RB": "#6692FF", "Kick Sauber": "#52E252",
-    "Haas F1 Team": "#B6BABD", "Haas": "#B6BABD", "Sauber": "#52E252",
-    "AlphaTauri": "#2B4562", "Racing Bulls": "#6692FF"
-}
-DEFAULT_COLOR = "#FF4B4B"
-
 CARD_BG = "#F3ECFF"   # Your brand card background
 FONT_PRIMARY = "Viga" # Your brand font
 
 st.set_page_config(page_title="F1 Qualifying", layout="centered")
 
-# Inject Google Font (Viga)
-st.markdown("""
-<style>
+# Inject Google Font (Viga) + card styles; per-card team colour comes in via --team
+MAIN_STYLES = f"""
 @import url('https://fonts.googleapis.com/css2?family=Viga&display=swap');
 
-html, body, [class*="css"] {
+html, body, [class*="css"] {{
     font-family: 'Viga', sans-serif !important;
-}
-</style>
-""", unsafe_allow_html=True)
+}}
+
+.driver-card {{ border: 1px solid rgba(49, 51, 63, 0.2); border-radius: 8px; padding: 16px; margin-bottom: 16px; }}
+.card-main {{ display: flex; align-items: center; gap: 12px; background: {CARD_BG}; padding: 12px; border-radius: 10px; }}
+.team-border {{ width: 6px; height: 50px; background: var(--team); border-radius: 4px; }}
+.driver-col {{ flex: 1; }}
+.driver-name {{ font-size: 20px; font-weight: 700; }}
+.lap-time {{ font-size: 18px; font-weight: 700; }}
+.card-sub {{ font-size: 13px; opacity: 0.7; }}
+.time-col {{ text-align: right; }}
+.sectors {{ display: flex; justify-content: space-between; margin-top: 6px; font-size: 13px; }}
+"""
+STYLE_BLOCK = f"<style>{MAIN_STYLES}</style>"
+
+st.markdown(STYLE_BLOCK, unsafe_allow_html=True)
 
 # === LOAD DATA ===
+TIME_COLS = ["LapTime", "Sector1Time", "Sector2Time", "Sector3Time"]
+# Narrow dtypes: categories for repeated strings, small ints for counters
+DTYPES = {
+    "Driver": "category", "Team": "category", "EventName": "category",
+    "Session": "category", "Compound": "category", "Status": "category",
+    "LapNumber": "Int16", "Stint": "Int8", "Position": "Int8",
+    "RoundNumber": "int8", "Round": "int8", "Year": "int16",
+}
+
 @st.cache_data
 def load_data():
     try:
         path = os.path.join(DATA_DIR, "qualy_laps_2024_onwards.csv")
-        return pd.read_csv(path)
+        df = pd.read_csv(path, dtype=DTYPES)
     except FileNotFoundError:
         return None
 
-df = load_data()
-if df is None:
+    # Parse time strings once per load, not on every filter change
+    for col in TIME_COLS:
+        df[col] = pd.to_timedelta(df[col], errors="coerce").dt.total_seconds()
+    return df
+
+# The CSV is loaded whole once and sliced in memory per event
+@st.cache_data
+def load_index():
+    df = load_data()
+    return None if df is None else df[["Year", "EventName"]].drop_duplicates()
+
+@st.cache_data
+def load_event(year, event):
+    df = load_data()
+    session = df[(df["Year"] == year) & (df["EventName"] == event)]
+    # The committed qualifying CSV predates the ingest-time Color column
+    if "Color" not in session.columns:
+        session = session.assign(Color=team_colors(session["Team"]))
+    return session
+
+index = load_index()
+if index is None:
     st.error("Data not found in /data. Please upload qualy_laps_2024_onwards.csv.")
     st.stop()
 
 # === FILTERS ===
-years = sorted(df["Year"].unique(), reverse=True)
+years = sorted(index["Year"].unique(), reverse=True)
 selected_year = st.selectbox("Season", years)
 
-events = df[df["Year"] == selected_year]["EventName"].unique()
+events = index[index["Year"] == selected_year]["EventName"].unique()
 selected_event = st.selectbox("Grand Prix", events)
 
 gap_mode = st.radio("Gap Mode", ["Gap to Pole", "Gap to Teammate"])
 
 # === PROCESSING ===
-session = df[(df["Year"] == selected_year) & (df["EventName"] == selected_event)].copy()
+def fmt_times(s):
+    secs = s.to_numpy(dtype="float64")
+    mins, rem = np.divmod(secs, 60)
+    out = np.where(
+        mins > 0,
+        [f"{m:.0f}:{r:06.3f}" for m, r in zip(mins, rem)],
+        [f"{r:.3f}" for r in rem],
+    )
+    return pd.Series(np.where(np.isnan(secs), "-", out), index=s.index)
+
+# The lap sort only depends on the event, so gap-mode toggles share it
+@st.cache_data
+def compute_best_laps(year, event):
+    session = load_event(year, event)
+    session = session.dropna(subset=["LapTime"])
+    # One O(N) pass for each driver's fastest lap; only the ~20 winners get sorted
+    idx = session.groupby("Driver", sort=False, observed=True)["LapTime"].idxmin()
+    return session.loc[idx].sort_values("LapTime").reset_index(drop=True)
+
+# Widget reruns with unchanged inputs reuse the finished table
+@st.cache_data
+def compute_best(year, event, gap_mode):
+    best = compute_best_laps(year, event)
+    best["Pos"] = best.index + 1
+
+    # === GAP CALCULATION ===
+    if gap_mode == "Gap to Pole":
+        pole = best.iloc[0]["LapTime"]
+        best["Gap"] = best["LapTime"] - pole
+    else:
+        # Fastest driver is compared to the second car, everyone else to the fastest
+        team_laps = best.groupby("Team")["LapTime"]
+        fastest = team_laps.transform("min")
+        ranks = team_laps.rank(method="first")
+        second = best["LapTime"].where(ranks == 2).groupby(best["Team"]).transform("min")
+        best["Gap"] = np.where(
+            best["LapTime"].eq(fastest),
+            best["LapTime"] - second.fillna(best["LapTime"]),
+            best["LapTime"] - fastest,
+        )
 
-def parse_time(t):
-    try:
-        if pd.isna(t) or t == "":
-            return None
-        return pd.to_timedelta(t).total_seconds()
-    except:
-        return None
+    # === FORMATTED FIELDS FOR IMAGE EXPORT ===
+    best["LapTime_fmt"] = fmt_times(best["LapTime"])
+    gaps = best["Gap"].to_numpy(dtype="float64")
+    best["Gap_fmt"] = np.where(
+        (gaps == 0) & (gap_mode == "Gap to Pole"), "POLE", [f"{g:+.3f}s" for g in gaps]
+    )
+    return best
 
-for col in ["LapTime", "Sector1Time", "Sector2Time", "Sector3Time"]:
-    session[col] = session[col].apply(parse_time)
-
-session = session.dropna(subset=["LapTime"])
-
-best = session.sort_values("LapTime").drop_duplicates("Driver").reset_index(drop=True)
-best["Color"] = best["Team"].map(TEAM_COLORS).fillna(DEFAULT_COLOR)
-best["Pos"] = best.index + 1
-
-def fmt_time(s):
-    if pd.isna(s):
-        return "-"
-    m, sec = divmod(s, 60)
-    return f"{int(m)}:{sec:06.3f}" if m > 0 else f"{sec:.3f}"
-
-# === GAP CALCULATION ===
-if gap_mode == "Gap to Pole":
-    pole = best.iloc[0]["LapTime"]
-    best["Gap"] = best["LapTime"] - pole
-else:
-    gaps = []
-    for _, row in best.iterrows():
-        team_laps = best[best["Team"] == row["Team"]].sort_values("LapTime")
-        if len(team_laps) > 1:
-            fastest = team_laps.iloc[0]["LapTime"]
-            if row["LapTime"] == fastest:
-                second = team_laps.iloc[1]["LapTime"]
-                gap = row["LapTime"] - second
-            else:
-                gap = row["LapTime"] - fastest
-        else:
-            gap = 0
-        gaps.append(gap)
-    best["Gap"] = gaps
-
-# === FORMATTED FIELDS FOR IMAGE EXPORT ===
-best["LapTime_fmt"] = best["LapTime"].apply(fmt_time)
-best["Gap_fmt"] = best["Gap"].apply(
-    lambda g: "POLE" if g == 0 and gap_mode == "Gap to Pole" else f"{g:+.3f}s"
-)
+best = compute_best(selected_year, selected_event, gap_mode)
 
 # === HEADER ===
 st.title(f"{selected_event} — Qualifying")
 st.caption(f"Season {selected_year}")
 
 # === DRIVER CARDS (F1 App Style) ===
-for _, row in best.iterrows():
-    with st.container(border=True):
-        st.markdown(
-            f"""
-            <div style="display:flex; align-items:center; gap:12px; background:{CARD_BG}; padding:12px; border-radius:10px;">
-                <div style="width:6px; height:50px; background:{row['Color']}; border-radius:4px;"></div>
-                <div style="flex:1;">
-                    <div style="font-size:20px; font-weight:700;">{row['Pos']}. {row['Driver']}</div>
-                    <div style="font-size:13px; opacity:0.7;">{row['Team']}</div>
-                </div>
-                <div style="text-align:right;">
-                    <div style="font-size:18px; font-weight:700;">{row['LapTime_fmt']}</div>
-                    <div style="font-size:13px; opacity:0.7;">{row['Gap_fmt']}</div>
-                </div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-        st.markdown(
-            f"""
-            <div style="display:flex; justify-content:space-between; margin-top:6px; font-size:13px;">
-                <div>S1: {row['Sector1Time']:.3f}</div>
-                <div>S2: {row['Sector2Time']:.3f}</div>
-                <div>S3: {row['Sector3Time']:.3f}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+# No blank lines inside the markup: markdown would end the HTML block there
+cards = []
+for row in best.itertuples(index=False):
+    cards.append(f"""<div class="driver-card" style="--team:{row.Color}">
+<div class="card-main">
+<div class="team-border"></div>
+<div class="driver-col"><div class="driver-name">{row.Pos}. {row.Driver}</div><div class="card-sub">{row.Team}</div></div>
+<div class="time-col"><div class="lap-time">{row.LapTime_fmt}</div><div class="card-sub">{row.Gap_fmt}</div></div>
+</div>
+<div class="sectors"><div>S1: {row.Sector1Time:.3f}</div><div>S2: {row.Sector2Time:.3f}</div><div>S3: {row.Sector3Time:.3f}</div></div>
+</div>
+""")
+cards_html = "".join(cards)
+st.markdown(cards_html, unsafe_allow_html=True)
 
 # === IMAGE RENDERER (PORTRAIT) ===
-def render_results_image(best, event, year):
-    width = 1080
-    card_height = 180
-    padding = 40
-    total_height = padding + len(best) * (card_height + 20)
-
-    img = Image.new("RGB", (width, total_height), CARD_BG)
-    draw = ImageDraw.Draw(img)
-
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 60)
-        name_font = ImageFont.truetype("arial.ttf", 48)
-        small_font = ImageFont.truetype("arial.ttf", 36)
-    except:
-        title_font = name_font = small_font = ImageFont.load_default()
-
-    draw.text((padding, padding), f"{event} — Qualifying {year}", fill="black", font=title_font)
-    y = padding + 100
-
-    for _, row in best.iterrows():
-        draw.rectangle([padding, y, width - padding, y + card_height], fill=CARD_BG)
-        draw.rectangle([padding, y, padding + 12, y + card_height], fill=row["Color"])
-
-        draw.text((padding + 30, y + 10), f"{row['Pos']}. {row['Driver']}", fill="black", font=name_font)
-        draw.text((padding + 30, y + 80), row["Team"], fill="#555", font=small_font)
-
-        draw.text((width - padding - 300, y + 20), row["LapTime_fmt"], fill="black", font=name_font)
-        draw.text((width - padding - 300, y + 90), row["Gap_fmt"], fill="#444", font=small_font)
-
-        y += card_height + 20
-
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return buf.getvalue()
+# Screenshot of the same card markup shown on the page, so the PNG can't drift from it.
+# Playwright's sync API is tied to the thread that started it and Streamlit reruns on
+# other threads, so the PNG is cached rather than a long-lived browser.
+@st.cache_data(show_spinner=False)
+def render_results_image(body_html):
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page(viewport={"width": 720, "height": 400})
+        page.set_content(
+            f"<html><head>{STYLE_BLOCK}</head><body style='margin:24px;'>{body_html}</body></html>",
+            wait_until="networkidle"
+        )
+        png = page.screenshot(full_page=True, type="png")
+        browser.close()
+    return png
 
 # === EXPORT SECTION ===
 st.markdown("---")
@@ -192,10 +190,16 @@ st.download_button(
 )
 
 # PNG IMAGE
-image_bytes = render_results_image(best, selected_event, selected_year)
-st.download_button(
-    label="📸 Download as Image (PNG)",
-    data=image_bytes,
-    file_name=f"qualifying_{selected_event}_{selected_year}.png",
-    mime="image/png"
-)
+# Launching the browser takes seconds, so it only happens once asked for, not on every rerun
+if st.checkbox("Render PNG image", key="render_png"):
+    try:
+        image_bytes = render_results_image(f"<h2>{selected_event} — Qualifying {selected_year}</h2>{cards_html}")
+    except PlaywrightError:
+        st.caption("PNG export needs a headless browser: run `playwright install chromium`.")
+    else:
+        st.download_button(
+            label="📸 Download as Image (PNG)",
+            data=image_bytes,
+            file_name=f"qualifying_{selected_event}_{selected_year}.png",
+            mime="image/png"
+        )
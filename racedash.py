@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import os
 
@@ -7,22 +8,14 @@ import os
 DATA_DIR = r"C:\Users\louie\OneDrive\Desktop\F1_Data"
 
 # === BRAND CONFIG ===
-TEAM_COLORS = {
-    "Red Bull Racing": "#0600EF", "Ferrari": "#DC0000", "McLaren": "#FF8700",
-    "Mercedes": "#00D2BE", "Aston Martin": "#006F62", "Alpine": "#0090FF",
-    "Williams": "#005AFF", "RB": "#6692FF", "Kick Sauber": "#52E252",
-    "Haas F1 Team": "#B6BABD", "Haas": "#B6BABD", "Sauber": "#52E252",
-    "AlphaTauri": "#2B4562", "Racing Bulls": "#6692FF"
-}
-DEFAULT_COLOR = "#FF4B4B"
 TEXT_COLOR = "#332166"
 BRAND_BG_COLOR = "#F3ECFF"
 
 st.set_page_config(page_title="F1 Race Dashboard", layout="wide")
 
 # === STYLES ===
-st.markdown(f"""
-<style>
+# Built once at import from module constants; every rerun sends the identical string
+MAIN_STYLES = f"""
 @import url('https://fonts.googleapis.com/css2?family=Viga&display=swap');
 @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;700&display=swap');
 
@@ -50,129 +43,251 @@ html, body, [class*="css"], h1, h2, h3, p, div, span {{
 /* WIDENED COLUMNS FOR NEW NAMES */
 .seas-col {{ width: 130px; text-align: center; font-size: 14px; color: #666; border-left: 1px solid #EEE; }}
 .time-col {{ width: 110px; text-align: right; font-size: 14px; color: #444; font-family: 'Roboto', monospace; }}
-.team-border {{ width: 4px; height: 35px; margin-right: 15px; border-radius: 2px; }}
-</style>
-""", unsafe_allow_html=True)
+.team-border {{ width: 4px; height: 35px; margin-right: 15px; border-radius: 2px; background-color: var(--team); }}
+"""
+STYLE_BLOCK = f"<style>{MAIN_STYLES}</style>"
+
+st.markdown(STYLE_BLOCK, unsafe_allow_html=True)
 
 st.title("F1 Race Analysis")
 
 # === LOAD DATA ===
-@st.cache_data
-def load_data():
+# Narrow dtypes: categories for repeated strings, small ints for counters
+DTYPES = {
+    "Driver": "category", "Team": "category", "EventName": "category",
+    "Session": "category", "Compound": "category", "Status": "category", "Color": "category",
+    "LapNumber": "Int16", "Stint": "Int8", "Position": "Int8",
+    "RoundNumber": "int8", "Round": "int8", "Year": "int16",
+    # Points are whole or half values, exact in float32
+    "OfficialPoints": "float32",
+}
+# Only the columns the dashboard reads; the rest of FastF1's lap columns stay on disk
+KEEP = [
+    "Year", "RoundNumber", "EventName", "Session", "Driver", "Team",
+    "LapTime", "Sector1Time", "Sector2Time", "Sector3Time",
+    "Compound", "TyreLife", "Stint", "Position", "LapNumber",
+    "OfficialPos", "OfficialPoints", "Status", "Color",
+]
+
+def load_data(**read_kwargs):
     frames = []
     
-    race_path = os.path.join(DATA_DIR, "race_laps_2024_onwards.csv")
-    sprint_path = os.path.join(DATA_DIR, "sprint_laps_2024_onwards.csv")
+    # Parquet datasets written by ingest.py (lap/sector times already in seconds)
+    race_path = os.path.join(DATA_DIR, "race.parquet")
+    sprint_path = os.path.join(DATA_DIR, "sprint.parquet")
 
     if os.path.exists(race_path):
-        r = pd.read_csv(race_path)
+        r = pd.read_parquet(race_path, engine="pyarrow", **read_kwargs)
         if "Session" not in r.columns: r["Session"] = "Race"
         if "Round" in r.columns: r = r.rename(columns={"Round": "RoundNumber"})
         frames.append(r)
 
     if os.path.exists(sprint_path):
-        s = pd.read_csv(sprint_path)
+        s = pd.read_parquet(sprint_path, engine="pyarrow", **read_kwargs)
         if "Session" not in s.columns: s["Session"] = "Sprint"
         if "Round" in s.columns: s = s.rename(columns={"Round": "RoundNumber"})
         frames.append(s)
         
     if not frames: return None
     df = pd.concat(frames, ignore_index=True)
+    # Concat of differing categories falls back to object; partition keys come back as categoricals
+    df = df.astype({c: t for c, t in DTYPES.items() if c in df.columns})
+    # Parquet dictionaries keep first-seen order (mid-season subs land last); sort so grouping by Driver is alphabetical
+    if "Driver" in df.columns:
+        df["Driver"] = df["Driver"].cat.reorder_categories(sorted(df["Driver"].cat.categories))
     
     if "RoundNumber" in df.columns:
         df["RoundNumber"] = pd.to_numeric(df["RoundNumber"], errors='coerce')
         
     return df
 
-df = load_data()
+@st.cache_data
+def load_index():
+    # Only the columns needed to populate the filters
+    idx = load_data(columns=["Year", "RoundNumber", "EventName", "Session"])
+    if idx is None: return None
+    return idx.astype({"EventName": str, "Session": str}).drop_duplicates().sort_values(by=["RoundNumber"])
+
+@st.cache_data
+def load_year(year):
+    # Predicate pushdown: only this season's partitions are read from disk
+    return load_data(columns=KEEP, filters=[("Year", "==", year)])
+
+index = load_index()
 
-if df is None:
+if index is None:
     st.error(f"No data found in {DATA_DIR}")
     st.stop()
 
 # === SIDEBAR ===
 st.sidebar.header("Data Audit")
-years = sorted(df["Year"].unique(), reverse=True)
+years = sorted(index["Year"].unique(), reverse=True)
 selected_year = st.sidebar.selectbox("Year", years)
 
-# === FILTER LOGIC ===
-year_df = df[df["Year"] == selected_year].copy()
-year_df = year_df.sort_values(by=["RoundNumber"]) 
-
-events = year_df["EventName"].unique()
+year_index = index[index["Year"] == selected_year]
+events = year_index["EventName"].unique()
 selected_event = st.sidebar.selectbox("Event", events)
 
-avail_sessions = year_df[year_df["EventName"] == selected_event]["Session"].unique()
+avail_sessions = year_index[year_index["EventName"] == selected_event]["Session"].unique()
 default_idx = list(avail_sessions).index("Race") if "Race" in avail_sessions else 0
 selected_session_type = st.sidebar.selectbox("Session", avail_sessions, index=default_idx)
 
-session = year_df[
-    (year_df["EventName"] == selected_event) & 
-    (year_df["Session"] == selected_session_type)
-].copy()
+# === FILTER LOGIC ===
+@st.cache_data
+def load_session(year, event, stype):
+    # One event/session is a single round, so the year needs no sort before slicing
+    year_df = load_year(year)
 
-if session.empty:
-    st.warning("No data found for this session.")
-    st.stop()
+    session = year_df[
+        (year_df["EventName"] == event) & 
+        (year_df["Session"] == stype)
+    ].copy()
+
+    # ingest.py stores seconds; timedelta files from older ingests convert with one array divide
+    lap_time = session["LapTime"]
+    session["LapTimeSeconds"] = lap_time.to_numpy() / np.timedelta64(1, "s") if lap_time.dtype.kind == "m" else lap_time
+    return session
 
 # === CALCULATIONS ===
+# Keys are categories (see DTYPES); observed=True skips drivers absent from the slice
+# Sprints sort ahead of the race on the same weekend
+SESSION_ORDER = {"Sprint": 1, "Sprint Qualifying": 1, "Sprint Shootout": 1}
+
 def get_session_order(s):
-    return 1 if "Sprint" in str(s) else 2
+    return SESSION_ORDER.get(s, 2)
 
-year_df["SessionOrder"] = year_df["Session"].apply(get_session_order)
+@st.cache_data
+def compute_season(year):
+    # Standings only depend on the season, so every event/session pick reuses them
+    year_df = load_year(year)
 
-# Group & Sort
-season_results = year_df.groupby(["Driver", "RoundNumber", "SessionOrder", "Session"])["OfficialPoints"].max().reset_index()
-season_results = season_results.sort_values(by=["RoundNumber", "SessionOrder"])
+    # Look up the few Session categories once and take by code; the trailing 2 catches code -1
+    order_by_cat = np.array([get_session_order(c) for c in year_df["Session"].cat.categories] + [2], dtype="int8")
+    year_df["SessionOrder"] = order_by_cat[year_df["Session"].cat.codes.to_numpy()]
 
-# Calculate Totals
-season_results["RunningTotal"] = season_results.groupby("Driver")["OfficialPoints"].cumsum()
-season_results["SeasonTotal"] = season_results.groupby("Driver")["OfficialPoints"].transform("sum")
+    # Group & Sort
+    season_results = year_df.groupby(["Driver", "RoundNumber", "SessionOrder", "Session"], sort=False, observed=True)["OfficialPoints"].max().reset_index()
+    # Stable sort keeps each driver's rows in order for the cumsum below
+    season_results = season_results.sort_values(by=["RoundNumber", "SessionOrder"], kind="mergesort")
 
-# Current Round Stats
-current_round = session["RoundNumber"].iloc[0]
-current_order = get_session_order(selected_session_type)
+    # Calculate Totals
+    pts_by_driver = season_results.groupby("Driver", sort=False, observed=True)["OfficialPoints"]
+    season_results["RunningTotal"] = pts_by_driver.cumsum()
+    season_results["SeasonTotal"] = pts_by_driver.transform("sum")
+    return season_results
 
-current_stats = season_results[
-    (season_results["RoundNumber"] == current_round) & 
-    (season_results["SessionOrder"] == current_order)
-]
+# Helper Functions
+FINISHED = ["Finished", "nan", "+1 Lap", "+2 Laps", "+3 Laps"]
+
+def format_results(df):
+    # Whole-column version of the old per-row formatter
+    status = df["Status"].astype(str).to_numpy()
+    t = df["TotalRaceTime"].to_numpy(dtype="float64")
+    is_leader = df["SortPos"].to_numpy() == 1
+
+    # Integer h/m/s/ms split over the whole column; only leader rows become clock strings.
+    # Lap times are whole milliseconds, so round off the float noise of the sum rather than truncate
+    total_ms = np.rint(np.nan_to_num(t) * 1000).astype(np.int64)
+    h, rem = np.divmod(total_ms, 3_600_000)
+    m, rem = np.divmod(rem, 60_000)
+    s, ms = np.divmod(rem, 1000)
+    leader = np.full(len(df), "N/A", dtype=object)
+    for i in np.flatnonzero(is_leader & ~np.isnan(t)):
+        leader[i] = f"{h[i]}:{m[i]:02}:{s[i]:02}.{ms[i]:03}" if h[i] > 0 else f"{m[i]}:{s[i]:02}.{ms[i]:03}"
+
+    gap = np.char.mod("+%.3fs", df["GapToWinner"].to_numpy(dtype="float64")).astype(object)
+    out = np.select([~np.isin(status, FINISHED), is_leader], [status, leader], default=gap)
+    return pd.Series(out, index=df.index)
+
+def format_pts(s):
+    # Whole numbers without the .0, half points kept, missing shows as 0
+    arr = s.to_numpy(dtype="float64")
+    whole = np.nan_to_num(arr)
+    out = np.where(np.isnan(arr), "0", np.where(whole == np.trunc(whole), whole.astype(np.int64).astype(str), arr.astype(str)))
+    return pd.Series(out, index=s.index)
 
 # === DISPLAY DATA PREP ===
-session["LapTimeSeconds"] = pd.to_timedelta(session["LapTime"]).dt.total_seconds()
-drivers = session.groupby("Driver").first().reset_index()
-drivers["SortPos"] = pd.to_numeric(drivers["OfficialPos"], errors='coerce').fillna(999)
-drivers = drivers.sort_values("SortPos").reset_index(drop=True)
+@st.cache_data
+def compute_drivers(year, event, stype):
+    session = load_session(year, event, stype)
+    season_results = compute_season(year)
 
-total_times = session.groupby("Driver")["LapTimeSeconds"].sum().reset_index().rename(columns={"LapTimeSeconds": "TotalRaceTime"})
-drivers = drivers.merge(total_times, on="Driver", how="left")
-drivers = drivers.merge(current_stats[["Driver", "RunningTotal", "SeasonTotal"]], on="Driver", how="left")
+    # Current Round Stats
+    current_round = session["RoundNumber"].iloc[0]
+    current_order = get_session_order(stype)
 
-if not drivers.empty:
-    winner_time = drivers.iloc[0]["TotalRaceTime"]
-    drivers["GapToWinner"] = drivers["TotalRaceTime"] - winner_time
-else:
-    drivers["GapToWinner"] = 0
+    current_stats = season_results[
+        (season_results["RoundNumber"] == current_round) & 
+        (season_results["SessionOrder"] == current_order)
+    ]
 
-drivers["Color"] = drivers["Team"].map(TEAM_COLORS).fillna(DEFAULT_COLOR)
+    # Result fields repeat on every lap, so the first row per driver is enough
+    drivers = session[["Driver", "Team", "OfficialPos", "OfficialPoints", "Status", "Color"]].drop_duplicates(subset="Driver").reset_index(drop=True)
+    # ClassifiedPosition is "1".."20" or a letter code (R, D, NC...); letters sort last
+    off_pos = drivers["OfficialPos"]
+    if pd.api.types.is_numeric_dtype(off_pos):
+        drivers["SortPos"] = off_pos.fillna(999).astype("int16")
+    else:
+        off_pos = off_pos.astype(str)
+        is_num = off_pos.str.isdigit()
+        drivers["SortPos"] = np.where(is_num, off_pos.where(is_num, "0").astype("int16"), 999).astype("int16")
+    drivers = drivers.sort_values("SortPos", kind="mergesort").reset_index(drop=True)
+
+    # Driver-indexed lookups joined by key instead of column merges
+    # Race time per driver: stable sort on the Driver codes, then sum each run with reduceat
+    codes = session["Driver"].cat.codes.to_numpy()
+    keep = np.flatnonzero(codes >= 0)
+    order = keep[np.argsort(codes[keep], kind="stable")]
+    run_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, run_codes[1:] != run_codes[:-1]])
+    lap_secs = np.nan_to_num(session["LapTimeSeconds"].to_numpy(dtype="float64")[order])
+    total_times = pd.Series(np.add.reduceat(lap_secs, starts), index=session["Driver"].cat.categories[run_codes[starts]], name="TotalRaceTime")
+    drivers = drivers.join(total_times, on="Driver")
+    drivers = drivers.join(current_stats.set_index("Driver")[["RunningTotal", "SeasonTotal"]], on="Driver")
+
+    if not drivers.empty:
+        winner_time = drivers.iloc[0]["TotalRaceTime"]
+        drivers["GapToWinner"] = drivers["TotalRaceTime"] - winner_time
+    else:
+        drivers["GapToWinner"] = 0
+
+    drivers["Result"] = format_results(drivers)
+    off_pos = drivers["OfficialPos"]
+    drivers["PosStr"] = np.where(off_pos.isna().to_numpy(), "NC", off_pos.astype(str).to_numpy())
+    drivers["PtsStr"] = format_pts(drivers["OfficialPoints"])
+    drivers["RunStr"] = format_pts(drivers["RunningTotal"])
+    drivers["SeasStr"] = format_pts(drivers["SeasonTotal"])
+    return drivers
+
+ROW_TEMPLATE = """<div class="result-row" style="--team: {};">
+<div class="team-border"></div>
+<div class="pos-col">{}</div>
+<div class="driver-col"><span class="driver-name">{}</span><span class="team-name">{}</span></div>
+<div class="points-col">{}</div>
+<div class="seas-col">{}</div>
+<div class="seas-col" style="font-weight:bold;">{}</div>
+<div class="time-col">{}</div>
+</div>"""
 
-# Helper Functions
-def format_result(row):
-    status = str(row["Status"])
-    if status not in ["Finished", "nan", "+1 Lap", "+2 Laps", "+3 Laps"]: return status
-    if row["SortPos"] == 1:
-        t = row["TotalRaceTime"]
-        if pd.isna(t): return "N/A"
-        m, s = divmod(t, 60)
-        h, m = divmod(m, 60)
-        ms = int((t * 1000) % 1000)
-        if h > 0: return f"{int(h)}:{int(m):02}:{int(s):02}.{ms:03}"
-        return f"{int(m)}:{int(s):02}.{ms:03}"
-    return f"+{row['GapToWinner']:.3f}s"
-
-def format_pts(p):
-    if pd.isna(p): return "0"
-    return str(int(p)) if float(p).is_integer() else str(p)
+@st.cache_data
+def build_results_html(year, event, stype):
+    # Same key as compute_drivers, so a rerun with unchanged filters skips the string building
+    drivers = compute_drivers(year, event, stype)
+
+    # One template, filled column-wise by map instead of an f-string per row
+    return "".join(map(
+        ROW_TEMPLATE.format,
+        drivers["Color"].tolist(), drivers["PosStr"].tolist(), drivers["Driver"].tolist(), drivers["Team"].tolist(),
+        drivers["PtsStr"].tolist(), drivers["RunStr"].tolist(), drivers["SeasStr"].tolist(), drivers["Result"].tolist(),
+    ))
+
+session = load_session(selected_year, selected_event, selected_session_type)
+
+if session.empty:
+    st.warning("No data found for this session.")
+    st.stop()
+
+drivers = compute_drivers(selected_year, selected_event, selected_session_type)
 
 # === HTML TABLE (Interactive Main View) ===
 st.subheader(f"Results - {selected_session_type}")
@@ -187,34 +302,26 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-html_content = ""
-for _, row in drivers.iterrows():
-    pos = row["OfficialPos"] if not pd.isna(row["OfficialPos"]) else "NC"
-    
-    html_content += f"""<div class="result-row">
-<div class="team-border" style="background-color: {row['Color']};"></div>
-<div class="pos-col">{pos}</div>
-<div class="driver-col"><span class="driver-name">{row['Driver']}</span><span class="team-name">{row['Team']}</span></div>
-<div class="points-col">{format_pts(row["OfficialPoints"])}</div>
-<div class="seas-col">{format_pts(row["RunningTotal"])}</div>
-<div class="seas-col" style="font-weight:bold;">{format_pts(row["SeasonTotal"])}</div>
-<div class="time-col">{format_result(row)}</div>
-</div>"""
-
+html_content = build_results_html(selected_year, selected_event, selected_session_type)
 st.markdown(html_content, unsafe_allow_html=True)
 
 # === PACE CHART ===
 st.markdown("---")
 st.subheader("📈 Pace Evolution")
-pace = session.groupby(["LapNumber", "Driver"])["LapTimeSeconds"].mean().reset_index().merge(drivers[["Driver", "Color"]], on="Driver", how="left")
+pace = session.groupby(["LapNumber", "Driver"], sort=False, observed=True)["LapTimeSeconds"].mean().reset_index()
+driver_colors = dict(zip(drivers["Driver"], drivers["Color"]))
 fig_pace = go.Figure()
 max_laps = pace["LapNumber"].max()
-valid_drivers = pace.groupby("Driver")["LapNumber"].max()
-valid_drivers = valid_drivers[valid_drivers > (max_laps * 0.2)].index
-for driver in valid_drivers:
-    d = pace[pace["Driver"] == driver].sort_values("LapNumber")
-    if d.empty: continue
-    fig_pace.add_trace(go.Scatter(x=d["LapNumber"], y=d["LapTimeSeconds"].cumsum(), mode="lines", name=driver, line=dict(color=d["Color"].iloc[0], width=2)))
+# Sort once and cumsum per driver, then walk the groups instead of masking per driver
+pace = pace.sort_values(["Driver", "LapNumber"], kind="mergesort")
+by_driver = pace.groupby("Driver", sort=False, observed=True)
+pace["CumTime"] = by_driver["LapTimeSeconds"].cumsum()
+# Same grouping gives each driver's last lap; filter with a plain numpy mask
+last_lap = by_driver["LapNumber"].max()
+valid_drivers = last_lap.index.to_numpy()[last_lap.to_numpy(dtype="float64", na_value=np.nan) > (max_laps * 0.2)]
+for driver, d in pace[pace["Driver"].isin(valid_drivers)].groupby("Driver", sort=False, observed=True):
+    # CumTime is already computed above; hand Plotly the raw arrays
+    fig_pace.add_trace(go.Scattergl(x=d["LapNumber"].to_numpy(), y=d["CumTime"].to_numpy(), mode="lines", name=driver, line=dict(color=driver_colors[driver], width=2)))
 fig_pace.update_layout(xaxis_title="Lap", yaxis_title="Cumulative Time (s)", plot_bgcolor=BRAND_BG_COLOR, paper_bgcolor=BRAND_BG_COLOR, font=dict(family="Viga", size=12, color=TEXT_COLOR), height=500, margin=dict(l=20, r=20, t=30, b=40))
 st.plotly_chart(fig_pace, use_container_width=True)
 
@@ -222,62 +329,62 @@ st.plotly_chart(fig_pace, use_container_width=True)
 st.markdown("---")
 with st.expander("📷 Get Image of Results"):
     
-    driver_team_cells = [
-        f"<b>{row['Driver']}</b><br><span style='font-size:11px; color:#555'>{row['Team']}</span>"
-        for _, row in drivers.iterrows()
-    ]
+    # The figure is only built once asked for, not on every rerun
+    if st.checkbox("Render image table", key="render_tbl"):
+        # Cell columns handed to Plotly as ready-made arrays, reusing the strings built for the HTML table
+        driver_team_cells = ("<b>" + drivers["Driver"].astype(str) + "</b><br><span style='font-size:11px; color:#555'>" + drivers["Team"].astype(str) + "</span>").to_numpy()
     
-    strip_colors = drivers["Color"].tolist()
+        strip_colors = drivers["Color"].to_numpy()
     
-    fig_table = go.Figure(data=[go.Table(
-        columnorder = [0, 1, 2, 3, 4, 5, 6],
-        columnwidth = [6, 40, 250, 60, 130, 130, 100], 
-        
-        header=dict(
-            values=['', '<b>POS</b>', '<b>DRIVER / TEAM</b>', '<b>PTS</b>', '<b>CUMULATIVE TOTAL</b>', '<b>SEASON TOTAL</b>', '<b>TIME</b>'],
-            line_color='white',
-            fill_color='#332166',
-            align=['center', 'center', 'left', 'center', 'center', 'center', 'right'],
-            font=dict(color='white', size=12, family="Viga"),
-            height=30
-        ),
+        fig_table = go.Figure(data=[go.Table(
+            columnorder = [0, 1, 2, 3, 4, 5, 6],
+            columnwidth = [6, 40, 250, 60, 130, 130, 100], 
         
-        cells=dict(
-            values=[
-                ['' for _ in range(len(drivers))], 
-                drivers['OfficialPos'],
-                driver_team_cells,                 
-                drivers['OfficialPoints'].apply(format_pts),
-                drivers['RunningTotal'].apply(format_pts),
-                drivers['SeasonTotal'].apply(format_pts),
-                drivers.apply(format_result, axis=1)
-            ],
-            fill_color=[
-                strip_colors, 
-                'white', 'white', 'white', 'white', 'white', 'white'
-            ],
-            font=dict(
-                color=['#333', '#333', '#333', '#333', '#666', '#333', '#444'], 
-                size=13, 
-                family="Roboto"
+            header=dict(
+                values=['', '<b>POS</b>', '<b>DRIVER / TEAM</b>', '<b>PTS</b>', '<b>CUMULATIVE TOTAL</b>', '<b>SEASON TOTAL</b>', '<b>TIME</b>'],
+                line_color='white',
+                fill_color='#332166',
+                align=['center', 'center', 'left', 'center', 'center', 'center', 'right'],
+                font=dict(color='white', size=12, family="Viga"),
+                height=30
             ),
-            line_color='#E0E0E0',
-            align=['center', 'center', 'left', 'center', 'center', 'center', 'right'],
-            height=45 
+        
+            cells=dict(
+                values=[
+                    np.full(len(drivers), ""), 
+                    drivers["PosStr"].to_numpy(),
+                    driver_team_cells,                 
+                    drivers["PtsStr"].to_numpy(),
+                    drivers["RunStr"].to_numpy(),
+                    drivers["SeasStr"].to_numpy(),
+                    drivers["Result"].to_numpy()
+                ],
+                fill_color=[
+                    strip_colors, 
+                    'white', 'white', 'white', 'white', 'white', 'white'
+                ],
+                font=dict(
+                    color=['#333', '#333', '#333', '#333', '#666', '#333', '#444'], 
+                    size=13, 
+                    family="Roboto"
+                ),
+                line_color='#E0E0E0',
+                align=['center', 'center', 'left', 'center', 'center', 'center', 'right'],
+                height=45 
+            )
+        )])
+
+        fig_table.update_layout(
+            margin=dict(l=0, r=0, t=0, b=0),
+            height=len(drivers) * 45 + 40,
+            dragmode=False 
         )
-    )])
-
-    fig_table.update_layout(
-        margin=dict(l=0, r=0, t=0, b=0),
-        height=len(drivers) * 45 + 40,
-        dragmode=False 
-    )
-
-    my_config = {
-        'displayModeBar': True,
-        'displaylogo': False,
-        'modeBarButtonsToRemove': ['zoom', 'pan', 'select', 'lasso2d', 'zoomIn2d', 'zoomOut2d', 'autoScale2d', 'resetScale2d']
-    }
-
-    st.plotly_chart(fig_table, use_container_width=True, config=my_config)
-    st.caption("Hover over the table header to see the 📷 download button in the top-right.")
\ No newline at end of file
+
+        my_config = {
+            'displayModeBar': True,
+            'displaylogo': False,
+            'modeBarButtonsToRemove': ['zoom', 'pan', 'select', 'lasso2d', 'zoomIn2d', 'zoomOut2d', 'autoScale2d', 'resetScale2d']
+        }
+
+        st.plotly_chart(fig_table, use_container_width=True, config=my_config)
+        st.caption("Hover over the table header to see the 📷 download button in the top-right.")
\ No newline at end of file